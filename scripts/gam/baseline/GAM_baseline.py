@@ -13,12 +13,20 @@ Features:
 """
 
 import argparse
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
 from pathlib import Path
 import numpy as np
 import pandas as pd
 from pygam import LinearGAM
 
+try:
+    from numba import njit, prange
+except ModuleNotFoundError:  # numba is optional; the NumPy einsum path below is equivalent
+    njit = None
+
 # --- Repo-relative helpers ---
 try:
     from scripts.utils.path_shim import (
@@ -49,6 +57,129 @@ PAR_INDEX = (
 )
 PARAMETER_NAMES_SUBSET = [PARAMETER_NAMES_55[i] for i in PAR_INDEX]
 
+if njit is not None:
+    @njit(cache=True, parallel=True, fastmath=True, nogil=True)
+    def _stats_kernel(y_all, XT):
+        """
+        Per-feature var(y), (N-1)*cov(x, y) and (N-1)*var(x) via Welford
+        accumulators: one streaming pass per feature instead of separate
+        mean and centred-moment passes, and numerically stabler than the
+        naive sums. Features are independent, so the outer loop runs in
+        prange. Inputs are finite by construction: Xn/yn are masked before
+        the fit and a LinearGAM maps finite rows to finite predictions.
+        cache=True persists the compiled code on disk so the per-point
+        subprocess launches in a sweep pay the JIT warmup once, not once
+        per process.
+        """
+        F, N = y_all.shape
+        variances = np.empty(F)
+        num = np.empty(F)
+        den = np.empty(F)
+        for i in prange(F):
+            mx = 0.0
+            my = 0.0
+            Mxx = 0.0
+            Myy = 0.0
+            Mxy = 0.0
+            for j in range(N):
+                x = XT[i, j]
+                yv = y_all[i, j]
+                n = j + 1
+                dx = x - mx
+                dy = yv - my
+                mx += dx / n
+                my += dy / n
+                Mxx += dx * (x - mx)
+                Myy += dy * (yv - my)
+                Mxy += dx * (yv - my)
+            variances[i] = Myy / (N - 1) if N > 1 else 0.0
+            num[i] = Mxy
+            den[i] = Mxx
+        return variances, num, den
+
+def _perturbed_predictions_batched(gam, Xn: np.ndarray, med: np.ndarray) -> np.ndarray:
+    """
+    Fallback: evaluate the F perturbation designs with one batched predict.
+    Builds the full spline basis for all F*N rows, so prefer
+    `_perturbed_predictions` when pygam's internals are available.
+    """
+    N, F = Xn.shape
+    X_big = np.empty((F * N, F))
+    X_big[:] = med  # broadcast the median row; no tiled temporary
+    for i in range(F):
+        X_big[i * N:(i + 1) * N, i] = Xn[:, i]
+    return gam.predict(X_big).reshape(F, N)
+
+def _perturbed_predictions(gam, Xn: np.ndarray, med: np.ndarray) -> np.ndarray:
+    """
+    Predictions for the F single-feature perturbation designs without
+    rebuilding the full spline basis F times.
+
+    Each design equals the median row except for one live column, and a
+    LinearGAM is additive: f(x) = intercept + sum_j s_j(x_j). The F-1
+    frozen smooths therefore collapse into one scalar offset evaluated at
+    the median, and only the live feature's smooth s_i needs evaluating
+    along its observed column — F*N basis evaluations instead of F*N*F.
+    """
+    N, F = Xn.shape
+    med_row = med[None, :]
+    y_all = np.empty((F, N))
+
+    def _one_term(i):
+        term = gam.terms[i]
+        coef = gam.coef_[gam.terms.get_coef_indices(i)]
+        # Basis of smooth i only, at the observed column and at the median.
+        contrib = gam._modelmat(Xn, term=i).dot(coef)
+        at_med = float(gam._modelmat(med_row, term=i).dot(coef)[0])
+        return term.feature, base - at_med + contrib
+
+    try:
+        # Intercept + every smooth at the median (scalar).
+        base = float(gam.predict(med_row)[0])
+        smooth_idx = [i for i, term in enumerate(gam.terms) if not term.isintercept]
+        # The smooths are independent and scipy's sparse basis products release
+        # the GIL, so spread them over threads (processes would only add a
+        # pickle of the fitted GAM per worker).
+        workers = min(len(smooth_idx), os.cpu_count() or 1) or 1
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            for feature, row in ex.map(_one_term, smooth_idx):
+                y_all[feature] = row
+    except AttributeError:
+        # pygam internals moved — fall back to the batched single predict.
+        return _perturbed_predictions_batched(gam, Xn, med)
+
+    return y_all
+
+def _write_vector(path: Path, values: np.ndarray, fmt: str) -> None:
+    """
+    Write a small 1-D vector as legacy .dat text (kept for the R/compare
+    tooling) without np.savetxt's per-value formatter machinery, plus a
+    binary .npy twin for fast reloads in sweeps.
+    """
+    path.write_text("\n".join(fmt % v for v in values) + "\n", encoding="ascii")
+    np.save(path.with_suffix(".npy"), values)
+
+def _ensure_lhc_cache(sample_file: Path) -> Path:
+    """
+    Build (once) and return a binary .npy sibling of the ASCII LHC sample.
+    np.loadtxt re-tokenises the whole 1,000,000-row text file on every run;
+    the cached copy memmaps in milliseconds and only pages in the rows used.
+    """
+    cache = sample_file.with_suffix(".par37.npy")
+    if not cache.exists() or cache.stat().st_mtime < sample_file.stat().st_mtime:
+        # usecols skips tokenising the 18 columns the pipeline never reads
+        # (the parser raises on rows narrower than max(PAR_INDEX)+1 columns).
+        LHC = pd.read_csv(sample_file, sep=r"\s+", header=None,
+                          usecols=list(PAR_INDEX), dtype=np.float64,
+                          engine="c").to_numpy()
+        # Write to a per-process temp name and rename into place so
+        # concurrent builders (e.g. sbatch array tasks sharing one LHC)
+        # never expose a half-written cache to readers.
+        tmp = cache.with_name(f"{cache.stem}.{os.getpid()}.tmp.npy")
+        np.save(tmp, LHC)
+        os.replace(tmp, cache)
+    return cache
+
 def load_lhc_first_n(sample_file: Path, rows_needed: int) -> np.ndarray:
     """
     Case B: Load raw LHC and return the FIRST rows_needed rows (no retained indices).
@@ -58,16 +189,100 @@ def load_lhc_first_n(sample_file: Path, rows_needed: int) -> np.ndarray:
     if not sample_file.exists():
         raise FileNotFoundError(f"Missing LHC sample file: {sample_file}")
 
-    LHC = np.loadtxt(sample_file)
-    if LHC.ndim != 2 or LHC.shape[1] < 55:
-        raise ValueError(f"LHC must be [n,>=55]; got {LHC.shape}")
+    LHC = np.load(_ensure_lhc_cache(sample_file), mmap_mode="r")
+    if LHC.ndim != 2 or LHC.shape[1] != len(PAR_INDEX):
+        raise ValueError(f"LHC subset must be [n,{len(PAR_INDEX)}]; got {LHC.shape}")
 
     if LHC.shape[0] < rows_needed:
         raise ValueError(f"LHC has only {LHC.shape[0]} rows; need {rows_needed}")
 
-    X = LHC[:rows_needed, :][:, PAR_INDEX]
+    # The cache already holds only PAR_INDEX columns; materialise just the
+    # rows actually used from the memmap.
+    X = np.array(LHC[:rows_needed])
     return X
 
+def _stats_from_fit(gam, Xn: np.ndarray):
+    """
+    Variance importances and gradient signs from an already-fitted GAM
+    (vectorised across features). Returns (variances, grad_sign).
+    """
+    N = Xn.shape[0]
+    med = np.median(Xn, axis=0)
+    eps_var = 1e-15
+
+    # Per-feature perturbation predictions: frozen smooths are folded into a
+    # scalar offset and only the live feature's smooth is evaluated per row.
+    y_all = _perturbed_predictions(gam, Xn, med)
+
+    # variance importance (sample variance with ddof=1 to match earlier baseline)
+    # and robust slope = cov/var per feature; JIT-compiled kernel when numba is
+    # installed, equivalent fused-einsum path otherwise.
+    # Feature-major copy: each feature's N samples become one contiguous row
+    # (matching the (F, N) layout of y_all), so the reductions below stream
+    # whole cache lines instead of striding across the C-ordered (N, F) design.
+    XT = np.ascontiguousarray(Xn.T)
+    if njit is not None:
+        variances, num, den = _stats_kernel(y_all, XT)
+    else:
+        Yc = y_all - y_all.mean(axis=1, keepdims=True)
+        Xc = XT - XT.mean(axis=1, keepdims=True)
+        variances = np.einsum("ij,ij->i", Yc, Yc) / max(N - 1, 1)
+        num = np.einsum("ij,ij->i", Yc, Xc)    # (N-1) * cov(x, y)
+        den = np.einsum("ij,ij->i", Xc, Xc)    # (N-1) * var(x)
+    ok = den > eps_var * max(N - 1, 1)
+    slopes = np.where(ok, num / np.where(ok, den, 1.0), 0.0)
+    grad_sign = np.sign(slopes)
+
+    # Degenerate (near-constant) columns carry no signal.
+    const = np.nanstd(Xn, axis=0) < 1e-12
+    variances[const] = 0.0
+    grad_sign[const] = 0.0
+
+    return variances, grad_sign
+
+def compute_gam_stats(Xn: np.ndarray, yn: np.ndarray):
+    """
+    Fit a GAM with default per-feature smooths (match original concept) and
+    return (variances, grad_sign). LinearGAM() with no explicit terms builds
+    one default s() per column internally.
+    """
+    gam = LinearGAM().fit(Xn, yn)
+    return _stats_from_fit(gam, Xn)
+
+def compute_gam_stats_batch(Xn: np.ndarray, ys) -> list:
+    """
+    Stats for several response vectors sharing one design matrix (e.g. the
+    grid points of a sweep, which all use the same first-N LHC rows).
+
+    The spline basis B(Xn) and the factorisation of (BᵀB + λS) depend only
+    on Xn and the default smoothing parameters, so fit once and re-solve
+    just the right-hand side Bᵀy for every further response — saving one
+    basis construction and one factorisation per extra grid point.
+    """
+    ys = list(ys)
+    if not ys:
+        return []
+
+    gam = LinearGAM().fit(Xn, ys[0])
+    results = [_stats_from_fit(gam, Xn)]
+    if len(ys) == 1:
+        return results
+
+    try:
+        from scipy.sparse.linalg import splu
+        B = gam._modelmat(Xn)
+        solve = splu((B.T.dot(B) + gam._P()).tocsc()).solve
+        for yv in ys[1:]:
+            g = deepcopy(gam)
+            g.coef_ = solve(B.T.dot(np.ravel(yv)))
+            results.append(_stats_from_fit(g, Xn))
+    except AttributeError:
+        # pygam internals moved — fall back to one full fit per response.
+        for yv in ys[1:]:
+            results.append(compute_gam_stats(Xn, yv))
+
+    return results
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--ilat", type=float, required=True)
@@ -93,19 +308,16 @@ def main():
     y = np.loadtxt(gp_file)
     if y.ndim == 2 and y.shape[1] > 1:
         y = y[:, 0]
-    y = np.asarray(y, dtype=float).ravel()
+    y = y.ravel()  # np.loadtxt already returns float64
 
     # --- LHC sample (Case B: FIRST N rows; NO indices) ---
     default_samples = REPO / "examples" / "large_sample" / "constrained_multi_million_sample_first_million.dat"
     sample_path = Path(args.samples) if args.samples else default_samples
 
-    X = load_lhc_first_n(sample_path, len(y))
-    X = np.asarray(X, dtype=float)
+    X = load_lhc_first_n(sample_path, len(y))  # float64 C-contiguous already
 
     # --- Clean non-finite rows BEFORE fitting ---
-    mask = np.isfinite(y)
-    for j in range(X.shape[1]):
-        mask &= np.isfinite(X[:, j])
+    mask = np.isfinite(y) & np.isfinite(X).all(axis=1)
 
     if not np.any(mask):
         raise ValueError("No finite rows remain after cleaning X/y.")
@@ -114,58 +326,16 @@ def main():
     yn = y[mask]
     N = len(yn)  # rows actually used
 
-    # --- Fit GAM with default per-feature smooths (match original concept) ---
-    # LinearGAM() with no explicit terms builds one default s() per column internally.
-    gam = LinearGAM().fit(Xn, yn)
-
-    # --- Variance & gradient sign (robust) ---
-    variances = np.zeros(Xn.shape[1], dtype=float)
-    grad_sign = np.zeros(Xn.shape[1], dtype=float)
-
-    med = np.median(Xn, axis=0)
-    X_med = np.tile(med, (N, 1))  # allocate once
-    eps_var = 1e-15
-
-    for i in range(Xn.shape[1]):
-        xcol = Xn[:, i]
-        if np.nanstd(xcol) < 1e-12:
-            variances[i] = 0.0
-            grad_sign[i] = 0.0
-            continue
-
-        X_med[:, :] = med
-        X_med[:, i] = xcol
-        y_pred = gam.predict(X_med)
-
-        finite = np.isfinite(xcol) & np.isfinite(y_pred)
-        if np.count_nonzero(finite) < 2:
-            variances[i] = 0.0
-            grad_sign[i] = 0.0
-            continue
-
-        yv = y_pred[finite]
-        xv = xcol[finite]
-
-        # variance importance (sample variance with ddof=1 to match earlier baseline; 
-        # switch to ddof=0 if you want population variance like some legacy code)
-        variances[i] = float(np.var(yv, ddof=1)) if len(yv) > 1 else 0.0
-
-        vx = np.var(xv, ddof=1) if len(xv) > 1 else 0.0
-        if vx < eps_var:
-            slope = 0.0
-        else:
-            # robust slope = cov/var; swap to np.polyfit(xv, yv, 1)[0] for exact legacy behaviour
-            slope = float(np.cov(xv, yv, ddof=1)[0, 1] / vx)
-
-        grad_sign[i] = 1.0 if slope > 0 else (-1.0 if slope < 0 else 0.0)
+    # --- Fit GAM & compute variance / gradient-sign importances ---
+    variances, grad_sign = compute_gam_stats(Xn, yn)
 
     # --- Save outputs (with true N in the name) ---
     N_out = int(N_gp) if (N_gp == len(y)) else int(N)
 
     out_var  = GAM_DIR / f"GAM_variances_{VAR}_{args.month}_{N_out}_ilat_{args.ilat:.3f}_ilon_{args.ilon:.4f}.dat"
     out_sign = GAM_DIR / f"GAM_gradient_signs_{VAR}_{args.month}_{N_out}_ilat_{args.ilat:.3f}_ilon_{args.ilon:.4f}.dat"
-    np.savetxt(out_var,  variances, fmt="%.8e")
-    np.savetxt(out_sign, grad_sign, fmt="%.0f")
+    _write_vector(out_var,  variances, "%.8e")
+    _write_vector(out_sign, grad_sign, "%.0f")
 
     print(f"✅ GAM baseline complete. rows_used={N}\n→ {out_var}\n→ {out_sign}")
 
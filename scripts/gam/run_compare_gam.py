@@ -8,6 +8,7 @@ Outputs CSV:
 """
 
 import subprocess, sys, time, os, csv
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # ---- Repo root & scripts
@@ -29,10 +30,33 @@ OUT_DIR = REPO / "examples" / "tiny_sample_outputs" / "gam_variance" / "comparis
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 CSV_PATH = OUT_DIR / "timing_compare.csv"
 
-def run_cmd(cmd, cwd) -> float:
+def prewarm_lhc_cache() -> None:
+    """
+    Parse the million-row LHC sample to its binary .npy cache once in the
+    parent, so the 4 concurrent baseline children all memmap the same file
+    (shared via the OS page cache) instead of racing to build it.
+    """
+    samples = REPO / "examples" / "large_sample" / "constrained_multi_million_sample_first_million.dat"
+    if not samples.exists():
+        return
+    try:
+        sys.path.append(str(BASELINE_PY.parent))
+        from GAM_baseline import _ensure_lhc_cache
+        print(f"[prewarm] LHC cache: {_ensure_lhc_cache(samples)}")
+    except Exception as e:  # missing deps etc. — children parse it themselves
+        print(f"[prewarm] Skipped LHC cache prewarm: {e}")
+
+def child_env() -> dict:
+    """Env for child runs: split cores across the concurrent grid points so the
+    inner mgcv/BLAS OpenMP threads don't oversubscribe the machine."""
+    env = os.environ.copy()
+    env.setdefault("OMP_NUM_THREADS", str(max(1, (os.cpu_count() or 1) // len(POINTS))))
+    return env
+
+def run_cmd(cmd, cwd, env=None) -> float:
     """Run a command and return elapsed seconds, raising on failure."""
     t0 = time.perf_counter()
-    proc = subprocess.run(cmd, cwd=str(cwd))
+    proc = subprocess.run(cmd, cwd=str(cwd), env=env)
     t1 = time.perf_counter()
     if proc.returncode != 0:
         raise RuntimeError(f"Command failed ({proc.returncode}): {' '.join(map(str, cmd))}")
@@ -41,20 +65,12 @@ def run_cmd(cmd, cwd) -> float:
 def run_baseline(lat: float, lon: float, month: str) -> float:
     # Baseline is Python; pass Case-B args (no indices) — script auto-discovers files
     cmd = [sys.executable, str(BASELINE_PY), "--ilat", f"{lat}", "--ilon", f"{lon}", "--month", month]
-    return run_cmd(cmd, REPO)
+    return run_cmd(cmd, REPO, env=child_env())
 
 def run_optimised(lat: float, lon: float, month: str) -> float:
     # Optimised is R; respects repo-relative paths inside the script
     cmd = ["Rscript", str(OPTIMISED_R), f"{lat}", f"{lon}", month]
-    # Optional: let mgcv use all cores if available (Linux/mac builds with OpenMP)
-    env = os.environ.copy()
-    env.setdefault("OMP_NUM_THREADS", str(os.cpu_count() or 1))
-    t0 = time.perf_counter()
-    proc = subprocess.run(cmd, cwd=str(REPO), env=env)
-    t1 = time.perf_counter()
-    if proc.returncode != 0:
-        raise RuntimeError(f"Command failed ({proc.returncode}): {' '.join(map(str, cmd))}")
-    return t1 - t0
+    return run_cmd(cmd, REPO, env=child_env())
 
 def main():
     # Existence checks
@@ -66,14 +82,23 @@ def main():
     rows = []
     print("\n== Running GAM BASELINE (Python) then OPTIMISED (R) for 4 points (month=jan) ==\n")
 
-    for lat, lon in POINTS:
-        tb = run_baseline(lat, lon, MONTH)
-        print(f"[baseline]  lat={lat:.3f} lon={lon:.4f}  time={tb:.2f}s")
-        rows.append({"case":"baseline","lat":lat,"lon":lon,"month":MONTH,"elapsed_s":tb})
-
-        to = run_optimised(lat, lon, MONTH)
-        print(f"[optimised] lat={lat:.3f} lon={lon:.4f}  time={to:.2f}s")
-        rows.append({"case":"optimised","lat":lat,"lon":lon,"month":MONTH,"elapsed_s":to})
+    prewarm_lhc_cache()
+
+    # The grid points are independent, so run each mode's 4 points concurrently;
+    # the subprocess waits release the GIL, so threads are enough.
+    with ThreadPoolExecutor(max_workers=len(POINTS)) as ex:
+        futures = [ex.submit(run_baseline, lat, lon, MONTH) for lat, lon in POINTS]
+        for (lat, lon), fut in zip(POINTS, futures):
+            tb = fut.result()
+            print(f"[baseline]  lat={lat:.3f} lon={lon:.4f}  time={tb:.2f}s")
+            rows.append({"case":"baseline","lat":lat,"lon":lon,"month":MONTH,"elapsed_s":tb})
+
+    with ThreadPoolExecutor(max_workers=len(POINTS)) as ex:
+        futures = [ex.submit(run_optimised, lat, lon, MONTH) for lat, lon in POINTS]
+        for (lat, lon), fut in zip(POINTS, futures):
+            to = fut.result()
+            print(f"[optimised] lat={lat:.3f} lon={lon:.4f}  time={to:.2f}s")
+            rows.append({"case":"optimised","lat":lat,"lon":lon,"month":MONTH,"elapsed_s":to})
 
     # Build comparison table keyed by (lat,lon)
     paired = {}
@@ -8,6 +8,7 @@ Outputs CSV:
 """
 
 import subprocess, sys, time, os, csv
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # ---- Repo root & scripts
@@ -29,11 +30,18 @@ OUT_DIR = REPO / "examples" / "tiny_sample_outputs" / "gp_emulation" / "comparis
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 CSV_PATH = OUT_DIR / "timing_compare.csv"
 
+def child_env() -> dict:
+    """Env for child runs: split cores across the concurrent grid points so the
+    inner R/BLAS OpenMP threads don't oversubscribe the machine."""
+    env = os.environ.copy()
+    env.setdefault("OMP_NUM_THREADS", str(max(1, (os.cpu_count() or 1) // len(POINTS))))
+    return env
+
 def run_r(script: Path, lat: float, lon: float, month: str) -> float:
     """Run Rscript <script> <lat> <lon> <month>, return elapsed seconds."""
     cmd = ["Rscript", str(script), f"{lat}", f"{lon}", month]
     t0 = time.perf_counter()
-    proc = subprocess.run(cmd, cwd=str(REPO))
+    proc = subprocess.run(cmd, cwd=str(REPO), env=child_env())
     t1 = time.perf_counter()
     if proc.returncode != 0:
         raise RuntimeError(f"Command failed ({proc.returncode}): {' '.join(cmd)}")
@@ -43,16 +51,21 @@ def main():
     rows = []
     print("\n== Running BASELINE then OPTIMISED for 4 points (month=jan) ==\n")
 
-    for lat, lon in POINTS:
-        # Baseline
-        tb = run_r(BASELINE, lat, lon, MONTH)
-        print(f"[baseline] lat={lat:.3f} lon={lon:.4f}  time={tb:.2f}s")
-        rows.append({"case":"baseline","lat":lat,"lon":lon,"month":MONTH,"elapsed_s":tb})
+    # The grid points are independent, so run each mode's 4 points concurrently;
+    # the subprocess waits release the GIL, so threads are enough.
+    with ThreadPoolExecutor(max_workers=len(POINTS)) as ex:
+        futures = [ex.submit(run_r, BASELINE, lat, lon, MONTH) for lat, lon in POINTS]
+        for (lat, lon), fut in zip(POINTS, futures):
+            tb = fut.result()
+            print(f"[baseline] lat={lat:.3f} lon={lon:.4f}  time={tb:.2f}s")
+            rows.append({"case":"baseline","lat":lat,"lon":lon,"month":MONTH,"elapsed_s":tb})
 
-        # Optimised
-        to = run_r(OPTIMISED, lat, lon, MONTH)
-        print(f"[optimised] lat={lat:.3f} lon={lon:.4f}  time={to:.2f}s")
-        rows.append({"case":"optimised","lat":lat,"lon":lon,"month":MONTH,"elapsed_s":to})
+    with ThreadPoolExecutor(max_workers=len(POINTS)) as ex:
+        futures = [ex.submit(run_r, OPTIMISED, lat, lon, MONTH) for lat, lon in POINTS]
+        for (lat, lon), fut in zip(POINTS, futures):
+            to = fut.result()
+            print(f"[optimised] lat={lat:.3f} lon={lon:.4f}  time={to:.2f}s")
+            rows.append({"case":"optimised","lat":lat,"lon":lon,"month":MONTH,"elapsed_s":to})
 
     # Build comparison table
     # key by (lat,lon)
@@ -20,7 +20,8 @@ Usage (from repo root):
 """
 
 from pathlib import Path
-import csv, time, subprocess, shutil, sys
+import csv, os, time, subprocess, shutil, sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 REPO = Path(__file__).resolve().parents[2]
@@ -31,10 +32,8 @@ OUT_OPTIMISED = OUT_ROOT / "optimised"
 LOG_DIR = REPO / "scripts" / "utils" / "outputs"
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 
-RSCRIPT = Path.environ.get("RSCRIPT_PATH") if hasattr(Path, "environ") else None
-if RSCRIPT is None:
-    # Fallback to just "Rscript" in PATH
-    RSCRIPT = "Rscript"
+# Honour RSCRIPT_PATH if set; fall back to "Rscript" in PATH
+RSCRIPT = os.environ.get("RSCRIPT_PATH", "Rscript")
 
 BASELINE_R = REPO / "scripts" / "gp" / "baseline" / "emulate_phase3_predict_DJF_baseline.R"
 OPTIMISED_R = REPO / "scripts" / "gp" / "optimised" / "emulate_phase3_predict_DJF_optimised.R"
@@ -71,32 +70,43 @@ def move_new_outputs(new_files, dest_dir):
         moved.append(target)
     return moved
 
+def run_task(mode_name, r_script, i, t, ntasks, env):
+    ilat = f"{float(t['lat']):.3f}"
+    ilon = f"{float(t['lon']):.3f}"
+    month = t["month"].strip()
+
+    cmd = [RSCRIPT, str(r_script), f"ilat={ilat}", f"ilon={ilon}", f"month={month}"]
+    start = time.perf_counter()
+    try:
+        subprocess.run(cmd, check=True, cwd=str(REPO), env=env)
+        ok = True
+        err = ""
+    except subprocess.CalledProcessError as e:
+        ok = False
+        err = str(e)
+    dt = time.perf_counter() - start
+    status = "OK" if ok else "FAIL"
+    print(f"[{mode_name}] Task {i}/{ntasks} ({ilat},{ilon},{month}) -> {status} in {dt:.2f}s")
+    return {"mode": mode_name, "task": i, "ilat": ilat, "ilon": ilon, "month": month, "ok": ok, "seconds": dt, "error": err}
+
 def run_mode(mode_name, r_script, tasks):
     print(f"\n=== Running mode: {mode_name} ===")
     # Capture pre-run files
     before = list_out_files()
 
-    per_task = []
-    t0 = time.perf_counter()
-    for i, t in enumerate(tasks, start=1):
-        ilat = f"{float(t['lat']):.3f}"
-        ilon = f"{float(t['lon']):.3f}"
-        month = t["month"].strip()
-
-        cmd = [RSCRIPT, str(r_script), f"ilat={ilat}", f"ilon={ilon}", f"month={month}"]
-        start = time.perf_counter()
-        try:
-            subprocess.run(cmd, check=True, cwd=str(REPO))
-            ok = True
-            err = ""
-        except subprocess.CalledProcessError as e:
-            ok = False
-            err = str(e)
-        dt = time.perf_counter() - start
-        per_task.append({"mode": mode_name, "task": i, "ilat": ilat, "ilon": ilon, "month": month, "ok": ok, "seconds": dt, "error": err})
-        status = "OK" if ok else "FAIL"
-        print(f"[{mode_name}] Task {i}/{len(tasks)} ({ilat},{ilon},{month}) -> {status} in {dt:.2f}s")
+    # Tasks are independent, so run them concurrently (the subprocess waits
+    # release the GIL); split cores across workers so the inner R/BLAS
+    # OpenMP threads don't oversubscribe. Output diffing stays safe because
+    # before/after snapshots bracket the whole mode, not individual tasks.
+    workers = min(len(tasks), os.cpu_count() or 1)
+    env = os.environ.copy()
+    env.setdefault("OMP_NUM_THREADS", str(max(1, (os.cpu_count() or 1) // workers)))
 
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        futures = [ex.submit(run_task, mode_name, r_script, i, t, len(tasks), env)
+                   for i, t in enumerate(tasks, start=1)]
+        per_task = [f.result() for f in futures]
     total = time.perf_counter() - t0
     # Detect and move new files for this mode
     after = list_out_files()
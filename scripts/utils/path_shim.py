@@ -5,6 +5,7 @@ Path shim for gp-gam-optimisation-pipeline
 - Provides canonical locations for tiny example inputs/outputs
 - Robust GP output file finder (baseline/optimised; multiple precisions)
 """
+from functools import lru_cache
 from pathlib import Path
 import re
 
@@ -27,6 +28,23 @@ def tiny_gam_out_dir(repo: Path) -> Path:
     return repo / "examples" / "tiny_sample_outputs" / "gam_variance"
 
 # --- Robust GP output finder for the GAM step ---
+_GP_PREFIX = "emulated_mean_values_H2SO4_"
+_GP_SUFFIX = "_w_o_carb.dat"
+
+@lru_cache(maxsize=None)
+def _compiled(pattern: str):
+    # Compiled-pattern cache so sweeps don't re-run re.compile per call.
+    return re.compile(pattern)
+
+@lru_cache(maxsize=None)
+def _dat_names(root_str: str, mtime_ns: int):
+    # Directory listing cached on (path, mtime); a new output file bumps the
+    # directory mtime and invalidates the entry.
+    return tuple(sorted(p.name for p in Path(root_str).glob("*.dat")))
+
+def _gp_names(root: Path):
+    return _dat_names(str(root), root.stat().st_mtime_ns)
+
 def find_gp_file(repo: Path, ilat: float, ilon: float, month: str) -> Path:
     """
     Look for GP mean file for (ilat, ilon, month) in:
@@ -46,58 +64,51 @@ def find_gp_file(repo: Path, ilat: float, ilon: float, month: str) -> Path:
         base / lat_folder,  # plain fallback
     ]
 
-    # Build several precision patterns (strict → relaxed)
-    precise = re.compile(
+    # Build several precision patterns (strict → relaxed); compilation is
+    # cached across calls for repeated (lat, lon, month) lookups in sweeps.
+    precise = _compiled(
         rf"^emulated_mean_values_H2SO4_{re.escape(month)}_ilat_{ilat:.3f}_ilon_{ilon:.4f}_(\d+)_w_o_carb\.dat$"
     )
 
     relaxed_patterns = [
-        re.compile(
+        _compiled(
             rf"^emulated_mean_values_H2SO4_{re.escape(month)}_ilat_{ilat:.3f}_ilon_{ilon:.3f}_(\d+)_w_o_carb\.dat$"
         ),
-        re.compile(
+        _compiled(
             rf"^emulated_mean_values_H2SO4_{re.escape(month)}_ilat_{ilat}_ilon_{ilon}_(\d+)_w_o_carb\.dat$"
         ),
     ]
 
     candidates = []
 
-    # Search each root
+    # Search each root; the directory is listed once per (root, mtime).
     for root in search_roots:
         if not root.exists():
             continue
+        names = _gp_names(root)
+        gp_names = [n for n in names if n.startswith(_GP_PREFIX)]
 
         # 1) precise pattern first
-        for p in root.glob("emulated_mean_values_H2SO4_*.dat"):
-            if precise.match(p.name):
-                candidates.append(p)
-
+        candidates = [root / n for n in gp_names if precise.match(n)]
         if candidates:
             break
 
         # 2) relaxed patterns
         for pat in relaxed_patterns:
-            for p in root.glob("emulated_mean_values_H2SO4_*.dat"):
-                if pat.match(p.name):
-                    candidates.append(p)
+            candidates = [root / n for n in gp_names if pat.match(n)]
             if candidates:
                 break
 
         if candidates:
             break
 
-        # 3) ultra-relaxed: check tokens in name
+        # 3) ultra-relaxed: plain substring checks (no regex needed)
         lat_key3 = f"{ilat:.3f}"
         lon_key3 = f"{ilon:.3f}"
-        for p in root.glob("*.dat"):
-            name = p.name
-            if (
-                "emulated_mean_values_H2SO4_" in name and
-                month in name and
-                lat_key3 in name and
-                lon_key3 in name
-            ):
-                candidates.append(p)
+        candidates = [
+            root / n for n in names
+            if _GP_PREFIX in n and month in n and lat_key3 in n and lon_key3 in n
+        ]
 
         if candidates:
             break